@@ -1,127 +1,162 @@
 # vim:tabstop=4:softtabstop=4:shiftwidth=4:textwidth=79:expandtab:autoindent:smartindent:fileformat=unix:
 
+import asyncio
+import os
 import signal
 import logging
+from concurrent.futures import Future, ThreadPoolExecutor
+from functools          import partial
+from typing             import Optional
 
 from src.utils.config               import Config
-from src.hardware                   import ButtonConfig
+from src.utils.exceptions           import ConfigError
 from src.controllers.button_manager import ButtonManager
 from src.display.manager            import DisplayManager
 
 logger = logging.getLogger('DisplayController')
 
+# Button id -> whether the button also has a hold action
+BUTTON_HANDLERS = (
+    ('1', True),   # press: cycle brightness / cancel menu, hold: Pi-hole menu
+    ('2', True),   # press: confirm option 1, hold: system menu
+    ('3', False),  # press: confirm option 2
+    ('4', False),  # press: confirm option 3
+)
+
+# Seconds shutdown waits for a running handler before cleaning up under it
+SHUTDOWN_TIMEOUT = 10.0
+
+# CPU for the event loop and gpiozero callback threads
+BUTTON_CPU = 0
+
+def pin_to_cpu(cpu: int) -> set:
+    """
+    Pin the calling thread, and threads it starts later, to one CPU
+
+    Returns:
+        The CPU set allowed before pinning, empty if pinning is unsupported
+    """
+    if not hasattr(os, 'sched_setaffinity'):
+        return set()
+    try:
+        allowed = os.sched_getaffinity(0)
+        os.sched_setaffinity(0, {cpu})
+        logger.debug("Pinned to CPU %d", cpu)
+        return allowed
+    except OSError as e:
+        logger.warning("Could not pin to CPU %d: %s", cpu, e)
+        return set()
+
+async def run(manager: ButtonManager, button_configs: dict, cpus: set) -> None:
+    """
+    Dispatch button events on a single event loop until SIGINT/SIGTERM/SIGHUP
+
+    gpiozero invokes button callbacks from its own thread; they only post
+    the event to a queue here. Handlers run one at a time on a worker thread
+    so long running updates don't block signal handling.
+
+    On shutdown a handler that is still running gets SHUTDOWN_TIMEOUT
+    seconds to finish before returning to cleanup. Past that, cleanup goes
+    ahead under it and exit waits for the worker thread to finish.
+    """
+    loop = asyncio.get_running_loop()
+    events: asyncio.Queue = asyncio.Queue()
+    stop = asyncio.Event()
+    # Handlers spawn the update commands, so give their thread all CPUs back
+    executor = ThreadPoolExecutor(
+        max_workers=1,
+        thread_name_prefix='dispatch',
+        initializer=(os.sched_setaffinity if cpus else None),
+        initargs=((0, cpus) if cpus else ())
+    )
+    # Handler currently on the worker thread
+    running: Optional[Future] = None
+
+    def post(handler, *args) -> None:
+        """Queue a button event from the gpiozero callback thread"""
+        loop.call_soon_threadsafe(events.put_nowait, (handler, args))
+
+    def on_signal(signum: int) -> None:
+        """Handle termination signals"""
+        logger.info("Received signal %d, cleaning up", signum)
+        stop.set()
+
+    async def dispatch() -> None:
+        """Run queued button handlers in order, and menu timeouts when due"""
+        nonlocal running
+        while True:
+            try:
+                handler, args = await asyncio.wait_for(events.get(),
+                                                       manager.next_timeout())
+            except TimeoutError:
+                handler, args = manager.poll_timeouts, ()
+            running = executor.submit(handler, *args)
+            try:
+                await asyncio.wrap_future(running)
+            except Exception as e:
+                logger.error("Error handling button event: %s", e)
+
+    # Configure and add buttons, routing events through the manager
+    for button_id, has_hold in BUTTON_HANDLERS:
+        btn_config = button_configs.get(button_id)
+        if btn_config is None:
+            raise ConfigError(f"No configuration for button {button_id}")
+        manager.add_button(
+            config=btn_config,
+            callback=partial(post, partial(manager.dispatch, button_id=button_id)),
+            hold_callback=(partial(post, partial(manager.dispatch_hold, button_id=button_id))
+                           if has_hold else None)
+        )
+
+    for signum in (signal.SIGTERM, signal.SIGINT, signal.SIGHUP):
+        loop.add_signal_handler(signum, on_signal, signum)
+
+    logger.info("PiHole Display started successfully")
+
+    dispatcher = loop.create_task(dispatch())
+    try:
+        await stop.wait()
+    finally:
+        dispatcher.cancel()
+        executor.shutdown(wait=False, cancel_futures=True)
+        if running is not None and not running.done():
+            logger.info("Waiting up to %gs for the running handler", SHUTDOWN_TIMEOUT)
+            done, _ = await asyncio.wait({asyncio.wrap_future(running)},
+                                         timeout=SHUTDOWN_TIMEOUT)
+            if not done:
+                logger.warning("Handler still running, exit waits for it to finish")
+
 def main():
     """Pi-Hole Display Main"""
+    display = manager = None
+    # Pin before gpiozero starts its threads so they inherit the affinity
+    cpus = pin_to_cpu(BUTTON_CPU)
     try:
         # Initialize configuration
         config = Config()
 
         # Initialize display manager
-        display = DisplayManager()
+        display = DisplayManager(config)
 
         # Create button manager with display
-        manager = ButtonManager(display)
+        manager = ButtonManager(display, config)
 
         # Check PADD session exists
         if not display.check_padd():
             logger.error("Failed to find PADD display session")
             return
 
-        def button1_held(hold_time: float):
-            """Button 1 hold - open Pi-hole update menu"""
-            if not manager.is_menu_active():
-                logger.debug("Selected Pi-Hole Menu")
-                manager.pihole.show_menu(hold_time)
-
-        def button1_pressed():
-            """Button 1 press - cycle brightness or cancel menu"""
-            if manager.is_menu_active():
-                logger.debug("Button 1 pressed - cancelling confirmation")
-                manager.cancel_confirmation()
-                return
-            try:
-                manager.backlight.step_brightness()
-                current_brightness = manager.backlight.get_brightness_percentage()
-                logger.info(f"Brightness changed to {current_brightness}%")
-            except Exception as e:
-                logger.error(f"Error handling button 1 press: {str(e)}")
-
-        def button2_held(hold_time: float):
-            """Button 2 hold - open system control menu"""
-            if not manager.is_menu_active():
-                logger.debug("Selected System Menu")
-                manager.system.show_menu(hold_time)
-
-        def button2_pressed():
-            """Button 2 press - confirm system update or gravity update"""
-            if manager.system.is_waiting_for_confirmation():
-                logger.debug("In system menu - confirming system update")
-                manager.system.request_system_update()
-            elif manager.pihole.is_waiting_for_confirmation():
-                logger.debug("In Pi-hole menu - confirming Gravity update")
-                manager.pihole.request_gravity_update()
-
-        def button3_pressed():
-            """Button 3 press - confirm system restart or Pi-hole update"""
-            if manager.system.is_waiting_for_confirmation():
-                logger.debug("In system menu - confirming restart")
-                manager.system.request_reboot()
-            elif manager.pihole.is_waiting_for_confirmation():
-                logger.debug("In Pi-hole menu - confirming Pi-hole update")
-                manager.pihole.request_pihole_update()
-
-        def button4_pressed():
-            """Button 4 press - confirm system shutdown or PADD update"""
-            if manager.system.is_waiting_for_confirmation():
-                logger.debug("In system menu - confirming shutdown")
-                manager.system.request_shutdown()
-            elif manager.pihole.is_waiting_for_confirmation():
-                logger.debug("In Pi-hole menu - confirming PADD update")
-                manager.pihole.request_padd_update()
-
-        # Get button configurations from config
-        button_configs = config.buttons
-
-        # Configure and add buttons
-        buttons_config = [
-            (ButtonConfig(**button_configs['1']), button1_pressed, button1_held),
-            (ButtonConfig(**button_configs['2']), button2_pressed, button2_held),
-            (ButtonConfig(**button_configs['3']), button3_pressed, None),
-            (ButtonConfig(**button_configs['4']), button4_pressed, None),
-        ]
-
-        # Add all buttons to the manager
-        for btn_config, callback, hold_callback in buttons_config:
-            manager.add_button(
-                config=btn_config,
-                callback=callback,
-                hold_callback=hold_callback
-            )
-
-        logger.info("PiHole Display started successfully")
-
-        # Set up signal handlers
-        def cleanup_handler(signum, frame):
-            """Handle cleanup on termination signals"""
-            logger.info(f"Received signal {signum}, cleaning up")
-            try:
-                manager.cleanup()
-            except NameError:
-                logger.warning("Manager not initialized during cleanup")
-            exit(0)
-
-        signal.signal(signal.SIGTERM, cleanup_handler)
-        signal.signal(signal.SIGINT, cleanup_handler)
-
-        # Wait for signals indefinitely
-        signal.pause()
+        # Run the event loop until a termination signal arrives
+        asyncio.run(run(manager, config.button_configs, cpus))
 
     except Exception as e:
         logger.critical(f"Unexpected error: {str(e)}", exc_info=True)
         raise
     finally:
-        if 'manager' in locals():
+        if manager is not None:
             manager.cleanup()
+        elif display is not None:
+            display.cleanup()
 
 if __name__ == "__main__":
     main()
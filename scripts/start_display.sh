@@ -43,26 +43,26 @@ log_msg "Project directory: $PROJECT_DIR"
 cleanup_on_error() {
     local exit_code=$?
     if [ $exit_code -ne 0 ] && [ -n "$SESSION_NAME" ]; then
-        if tmux has-session -t "$SESSION_NAME" 2>/dev/null; then
+        if tmux has-session -t "=$SESSION_NAME" 2>/dev/null; then
             log_msg "Cleaning up failed session due to error (exit code: $exit_code)"
-            tmux kill-session -t "$SESSION_NAME" 2>/dev/null
+            tmux kill-session -t "=$SESSION_NAME" 2>/dev/null
         fi
     fi
 }
 
 # Check tmux session health
 check_session_health() {
-    if ! tmux has-session -t "$SESSION_NAME" 2>/dev/null; then
+    if ! tmux has-session -t "=$SESSION_NAME" 2>/dev/null; then
         log_msg "ERROR: Tmux session lost"
         return 1
     fi
 
-    if ! tmux list-windows -t "$SESSION_NAME" | grep -q "$PADD_WINDOW"; then
+    if ! tmux list-windows -t "=$SESSION_NAME" | grep -q "$PADD_WINDOW"; then
         log_msg "ERROR: PADD window not found"
         return 1
     fi
 
-    if ! tmux list-windows -t "$SESSION_NAME" | grep -q "$CONTROL_WINDOW"; then
+    if ! tmux list-windows -t "=$SESSION_NAME" | grep -q "$CONTROL_WINDOW"; then
         log_msg "ERROR: Control window not found"
         return 1
     fi
@@ -99,9 +99,9 @@ wait_for_python() {
 # Restart Python controller in existing session
 restart_python_controller() {
     log_msg "Restarting Python controller in control window"
-    tmux send-keys -t "$SESSION_NAME:$CONTROL_WINDOW" C-c
+    tmux send-keys -t "=$SESSION_NAME:$CONTROL_WINDOW" C-c
     sleep 1
-    tmux send-keys -t "$SESSION_NAME:$CONTROL_WINDOW" "$PYTHON_PATH $MAIN_SCRIPT" Enter
+    tmux send-keys -t "=$SESSION_NAME:$CONTROL_WINDOW" "$PYTHON_PATH $MAIN_SCRIPT" Enter
 
     if wait_for_python; then
         log_msg "Python controller restarted successfully"
@@ -204,7 +204,7 @@ if [ "$TERM" == "linux" ] ; then
     fi
 
     # Create or attach to tmux session
-    if ! tmux has-session -t "$SESSION_NAME" 2>/dev/null; then
+    if ! tmux has-session -t "=$SESSION_NAME" 2>/dev/null; then
         log_msg "Creating new tmux session"
 
         # Create new tmux session with first window running PADD
@@ -218,19 +218,19 @@ if [ "$TERM" == "linux" ] ; then
         sleep 2
 
         # Verify tmux session exists
-        if ! tmux has-session -t "$SESSION_NAME" 2>/dev/null; then
+        if ! tmux has-session -t "=$SESSION_NAME" 2>/dev/null; then
             log_msg "ERROR: Failed to create tmux session"
             exit 1
         fi
         log_msg "Session created successfully"
 
         # Disable tmux status line
-        tmux set-option -t "$SESSION_NAME" status off
+        tmux set-option -t "=$SESSION_NAME:" status off
         sleep 1
 
         # Create second tmux window without specifying index
         log_msg "Creating control window"
-        if ! tmux new-window -t "$SESSION_NAME" -n "$CONTROL_WINDOW"; then
+        if ! tmux new-window -t "=$SESSION_NAME" -n "$CONTROL_WINDOW"; then
             log_msg "ERROR: Failed to create control window"
             exit 1
         fi
@@ -238,7 +238,7 @@ if [ "$TERM" == "linux" ] ; then
 
         # Send Python command to control window
         sleep 1
-        tmux send-keys -t "$SESSION_NAME:$CONTROL_WINDOW" "$PYTHON_PATH $MAIN_SCRIPT" Enter
+        tmux send-keys -t "=$SESSION_NAME:$CONTROL_WINDOW" "$PYTHON_PATH $MAIN_SCRIPT" Enter
         log_msg "Python command sent to control window"
 
         # Wait for Python process to start and stabilize
@@ -255,11 +255,11 @@ if [ "$TERM" == "linux" ] ; then
 
         # Select PADD tmux window as default
         sleep 1
-        tmux select-window -t "$SESSION_NAME:$PADD_WINDOW"
+        tmux select-window -t "=$SESSION_NAME:$PADD_WINDOW"
 
         # List tmux windows to verify creation
         log_msg "Current tmux windows:"
-        tmux list-windows -t "$SESSION_NAME" >> "$LOG_FILE" 2>&1
+        tmux list-windows -t "=$SESSION_NAME" >> "$LOG_FILE" 2>&1
 
         log_msg "Display controller startup completed successfully"
     else
@@ -291,6 +291,6 @@ if [ "$TERM" == "linux" ] ; then
     # Attach to tmux session if we're on tty1
     if [ "$(tty)" == "/dev/tty1" ]; then
         log_msg "Attaching to tmux session"
-        exec tmux attach-session -t "$SESSION_NAME"
+        exec tmux attach-session -t "=$SESSION_NAME"
     fi
 fi
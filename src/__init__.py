@@ -6,6 +6,7 @@ from .services    import PiHole, SystemOps
 from .utils       import (
     Config,
     ButtonFunction,
+    ConfirmationMode,
     CONFIRMATION_TIMEOUT,
     FEEDBACK_DELAY,
     PiHoleDisplayError,
@@ -26,6 +27,7 @@ __all__ = [
     'SystemOps',
     'Config',
     'ButtonFunction',
+    'ConfirmationMode',
     'CONFIRMATION_TIMEOUT',
     'FEEDBACK_DELAY',
     'PiHoleDisplayError',
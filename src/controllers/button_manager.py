@@ -1,9 +1,12 @@
 # vim:tabstop=4:softtabstop=4:shiftwidth=4:textwidth=79:expandtab:autoindent:smartindent:fileformat=unix:
 
+import math
+import time
 import logging
 from typing              import List, Callable, Optional
 from ..utils.exceptions  import ButtonError
 from ..utils.config      import Config
+from ..utils.constants   import ConfirmationMode
 from ..hardware          import ButtonConfig, ButtonHandler
 from ..display.backlight import DisplayBacklight
 from ..services.pihole   import PiHole
@@ -15,21 +18,32 @@ logger = logging.getLogger('DisplayController')
 class ButtonManager:
     """Manages multiple button instances and their associated controllers"""
 
-    def __init__(self, display_manager: DisplayManager):
+    def __init__(self, display_manager: DisplayManager, config: Optional[Config] = None):
         """
         Initialize button manager and controllers
 
         Args:
             display_manager: DisplayManager instance for display control
+            config: Optional already loaded Config instance
         """
         self.buttons: List[ButtonHandler] = []
         try:
             logger.info("Initializing ButtonManager and controllers")
             self.display = display_manager
-            self.backlight = DisplayBacklight() # Pass backlight to display manager
+            self.backlight = DisplayBacklight(config) # Pass backlight to display manager
             self.display.set_backlight(self.backlight)
             self.pihole = PiHole(display_manager=self.display)
             self.system = SystemOps(display_manager=self.display)
+
+            # Button id -> (system menu action, Pi-hole menu action, log labels)
+            self._confirm_actions = {
+                '2': (self.system.request_system_update, "system update",
+                      self.pihole.request_gravity_update, "Gravity update"),
+                '3': (self.system.request_reboot, "restart",
+                      self.pihole.request_pihole_update, "Pi-hole update"),
+                '4': (self.system.request_shutdown, "shutdown",
+                      self.pihole.request_padd_update, "PADD update"),
+            }
         except Exception as e:
             error_msg = f"Failed to initialize controllers: {str(e)}"
             logger.critical(error_msg)
@@ -60,27 +74,122 @@ class ButtonManager:
             logger.error(error_msg)
             raise ButtonError(error_msg)
 
+    @property
+    def confirmation_mode(self) -> ConfirmationMode:
+        """Menu currently waiting for confirmation, if any"""
+        return self.display.confirmation_mode
+
     def is_menu_active(self) -> bool:
         """Check if any menu is currently active"""
-        return self.pihole.is_waiting_for_confirmation() or self.system.is_waiting_for_confirmation()
+        return self.display.confirmation_mode is not ConfirmationMode.NONE
 
     def cancel_confirmation(self) -> None:
         """Cancel any pending confirmation in either pihole or system mode"""
-        if self.pihole.is_waiting_for_confirmation():
+        mode = self.display.confirmation_mode
+        if mode is ConfirmationMode.PIHOLE:
             self.pihole.cancel_update()
-        elif self.system.is_waiting_for_confirmation():
+        elif mode is ConfirmationMode.SYSTEM:
             self.system.cancel_confirmation()
 
+    def next_timeout(self) -> Optional[float]:
+        """
+        Seconds until the open menu times out, a deferred switch back to
+        PADD is due or a stepped brightness is written, None if none is
+        pending
+        """
+        deadline = min(self.display.confirmation_deadline,
+                       self.display.switch_deadline,
+                       self.backlight.step_deadline)
+        if deadline == math.inf:
+            return None
+        return max(0.0, deadline - time.monotonic())
+
+    def poll_timeouts(self) -> None:
+        """
+        Cancel the open menu if its confirmation timeout has passed, make
+        any deferred switch back to PADD and write any stepped brightness
+        that is due
+        """
+        self.backlight.poll_step()
+        if self.display.confirmation_timed_out():
+            logger.info("Menu selection timeout - cancelling")
+            self.cancel_confirmation()
+        self.display.poll_switch()
+
+    def dispatch(self, button_id: str) -> None:
+        """
+        Handle a button press
+
+        Button 1 cycles brightness or cancels an open menu. Buttons 2-4
+        confirm the matching action of whichever menu is open.
+
+        Args:
+            button_id: Button key as used in the buttons configuration
+        """
+        # A press queued behind other work may arrive after the menu's
+        # deadline, time it out first rather than confirm a stale menu.
+        # A failed switch back to PADD must not drop the press itself
+        try:
+            self.poll_timeouts()
+        except Exception as e:
+            logger.error(f"Error handling timeouts: {str(e)}")
+        mode = self.display.confirmation_mode
+
+        if button_id == '1':
+            if mode:
+                logger.debug("Button 1 pressed - cancelling confirmation")
+                self.cancel_confirmation()
+                return
+            try:
+                # Written by poll_step once presses pause, which logs it
+                self.backlight.step_brightness()
+                self.display.keep_brightness_step()
+            except Exception as e:
+                logger.error(f"Error handling button 1 press: {str(e)}")
+            return
+
+        actions = self._confirm_actions.get(button_id)
+        if actions is None:
+            return
+        system_action, system_label, pihole_action, pihole_label = actions
+        if mode is ConfirmationMode.SYSTEM:
+            logger.debug("In system menu - confirming %s", system_label)
+            system_action()
+        elif mode is ConfirmationMode.PIHOLE:
+            logger.debug("In Pi-hole menu - confirming %s", pihole_label)
+            pihole_action()
+
+    def dispatch_hold(self, hold_time: float, button_id: str) -> None:
+        """
+        Handle a button hold
+
+        Button 1 opens the Pi-hole update menu, button 2 the system menu.
+
+        Args:
+            hold_time: How long the button was held in seconds
+            button_id: Button key as used in the buttons configuration
+        """
+        if self.is_menu_active():
+            return
+        if button_id == '1':
+            logger.debug("Selected Pi-Hole Menu")
+            self.pihole.show_menu(hold_time)
+        elif button_id == '2':
+            logger.debug("Selected System Menu")
+            self.system.show_menu(hold_time)
+
     def cleanup(self) -> None:
-        """Clean up all managed resources"""
+        """Clean up all managed resources, safe to call more than once"""
         logger.info("Starting cleanup of ButtonManager")
+        # Detach buttons first so a repeated cleanup has nothing to close
+        buttons, self.buttons = self.buttons, []
         try:
-            for button in self.buttons:
+            for button in buttons:
                 button.cleanup()
             self.backlight.cleanup()
             self.pihole.cleanup()
             self.system.cleanup()
+            self.display.cleanup()
             logger.info("Cleanup completed successfully")
         except Exception as e:
             logger.error(f"Error during cleanup: {str(e)}")
-
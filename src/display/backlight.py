@@ -1,19 +1,33 @@
 # vim:tabstop=4:softtabstop=4:shiftwidth=4:textwidth=79:expandtab:autoindent:smartindent:fileformat=unix:
 
+import math
 import time
 import pigpio
 import logging
+from functools          import partial
+from typing             import Optional
 from ..utils.exceptions import BacklightError
 from ..utils.config     import Config
 
 logger = logging.getLogger('DisplayController')
 
+# Quiet period before a stepped brightness level is written to the PWM
+STEP_DEBOUNCE_DELAY = 0.04
+
+# hardware_PWM dutycycle for 100% on
+PWM_MAX_DUTY = 1000000
+
 class DisplayBacklight:
     """Controls display backlight brightness using hardware PWM via pigpio"""
 
-    def __init__(self):
-        """Initialize backlight with configuration from config file"""
-        config = Config().display.get('backlight', {})
+    def __init__(self, config: Optional[Config] = None):
+        """
+        Initialize backlight with configuration from config file
+
+        Args:
+            config: Optional already loaded Config instance
+        """
+        config = (config or Config()).display.get('backlight', {})
         self.pin: int = config['pin']
         self.gamma: float = config['gamma']
         self.retry_attempts: int = config['retry_attempts']
@@ -21,11 +35,28 @@ class DisplayBacklight:
 
         self.current_step = 0
         self.pi = None
+        # True while pigpio is connected and the pin is set up
+        self._ready = False
+        # hardware_PWM bound to pin and frequency, takes only the duty cycle
+        self._set_duty = None
+        # Duty cycle last written to the PWM, -1 if unknown
+        self._last_duty = -1
+        # Monotonic time a stepped level is due to be written, inf if none
+        self._step_deadline = math.inf
 
         # Get and validate brightness levels from config
         self.brightness_levels = config['brightness_levels']
         self._validate_brightness_levels()
 
+        # Precompute gamma corrected duty cycles and percentages per level
+        self._hw_levels = tuple(self._compute_hw_value(v) for v in self.brightness_levels)
+        # Duty cycle by raw value, including full brightness used by the menus
+        self._hw_lut = dict(zip(self.brightness_levels, self._hw_levels))
+        self._hw_lut.setdefault(1.0, self._compute_hw_value(1.0))
+        self._pct_levels = tuple(int(v * 100) for v in self.brightness_levels)
+        # Next step for each step, wrapping back to full brightness
+        self._next_step = tuple(range(1, len(self.brightness_levels))) + (0,)
+
         self._initialize_pwm()
 
     def _validate_brightness_levels(self) -> None:
@@ -36,17 +67,16 @@ class DisplayBacklight:
         if len(self.brightness_levels) < 2:
             raise BacklightError("brightness_levels must have at least 2 levels")
 
-        # Check all values are in range [0.0, 1.0]
+        # Check all values are in range [0.0, 1.0] and in descending order
+        previous = 1.0
         for i, level in enumerate(self.brightness_levels):
             if not isinstance(level, (int, float)):
                 raise BacklightError(f"brightness_levels[{i}] must be numeric, got {type(level)}")
             if not 0.0 <= level <= 1.0:
                 raise BacklightError(f"brightness_levels[{i}] = {level}, must be between 0.0 and 1.0")
-
-        # Check descending order
-        for i in range(len(self.brightness_levels) - 1):
-            if self.brightness_levels[i] < self.brightness_levels[i + 1]:
+            if level > previous:
                 raise BacklightError("brightness_levels must be in descending order")
+            previous = level
 
         # Warn if first level is not 1.0 (full brightness)
         if self.brightness_levels[0] != 1.0:
@@ -65,73 +95,143 @@ class DisplayBacklight:
 
                 # Set up pin as output
                 self.pi.set_mode(self.pin, pigpio.OUTPUT)
+                self._set_duty = partial(self.pi.hardware_PWM, self.pin, self.pwmf)
+                self._ready = True
 
                 # Start at full brightness (hardware_PWM frequency set in each call)
                 self.set_brightness(self.brightness_levels[0])
                 logger.info("PWM initialization successful")
                 break
             except Exception as e:
+                self._ready = False
                 logger.error(f"PWM initialization attempt {attempt + 1} failed: {str(e)}")
                 if attempt == self.retry_attempts - 1:
                     raise BacklightError(f"Failed to initialize PWM after {self.retry_attempts} attempts: {str(e)}")
                 time.sleep(0.5)
 
-    def _pwm_brightness_value(self, value: float) -> int:
+    def _compute_hw_value(self, value: float) -> int:
         """
         Normalize brightness value (0-1) to hardware PWM dutycycle (0-1000000)
         Applies gamma correction for perceptual linearity
         """
-        if value == 0:
+        if value <= 0:
             return 0
+        # Gamma correction has no effect at full brightness
+        if value >= 1.0:
+            return PWM_MAX_DUTY
         gamma_corrected = pow(value, self.gamma)
-        return min(1000000, max(0, int(gamma_corrected * 1000000)))
+        return min(PWM_MAX_DUTY, max(0, int(gamma_corrected * PWM_MAX_DUTY)))
+
+    def _pwm_brightness_value(self, value: float) -> int:
+        """Get hardware PWM dutycycle for a brightness value, using the lookup table when possible"""
+        hw_value = self._hw_lut.get(value)
+        if hw_value is None:
+            hw_value = self._compute_hw_value(value)
+        return hw_value
 
     def set_brightness(self, raw_value: float) -> None:
         """Set brightness using hardware PWM with gamma correction"""
-        if not self.pi or not self.pi.connected:
+        if not self._ready:
             logger.error("Attempted to set brightness but PWM not initialized")
             raise BacklightError("PWM not initialized")
 
+        # An explicit level overrides any stepped level still pending
+        self._step_deadline = math.inf
+
         try:
             hw_value = self._pwm_brightness_value(raw_value)
-            self.pi.hardware_PWM(self.pin, self.pwmf, hw_value)
-            logger.debug(f"Set brightness raw:{raw_value:.3f} hw_value:{hw_value}")
-        except Exception as e:
+            if hw_value == self._last_duty:
+                return
+            self._set_duty(hw_value)
+            self._last_duty = hw_value
+            logger.debug("Set brightness raw:%.3f hw_value:%d", raw_value, hw_value)
+        except (pigpio.error, OSError, TypeError, ValueError) as e:
             logger.error(f"Failed to set brightness: {str(e)}")
+            self._check_connection()
             raise BacklightError(f"Invalid brightness value: {str(e)}")
 
     def step_brightness(self) -> None:
-        """Step brightness down by one level, cycling back to 100% after 0%"""
-        if not self.pi or not self.pi.connected:
+        """
+        Step brightness down by one level, cycling back to 100% after 0%
+
+        The step is written by poll_step once STEP_DEBOUNCE_DELAY seconds
+        pass without further steps, so rapid presses result in a single PWM
+        update.
+        """
+        if not self._ready:
             logger.error("Attempted to step brightness but PWM not initialized")
             raise BacklightError("PWM not initialized")
 
+        # Move to next brightness level and restart the quiet period
+        self.current_step = self._next_step[self.current_step]
+        self._step_deadline = time.monotonic() + STEP_DEBOUNCE_DELAY
+
+    @property
+    def step_deadline(self) -> float:
+        """Monotonic time the stepped level is due to be written, inf if none"""
+        return self._step_deadline
+
+    def poll_step(self) -> None:
+        """Write the stepped level if its quiet period has passed"""
+        if time.monotonic() >= self._step_deadline:
+            self._apply_step()
+
+    def _apply_step(self) -> None:
+        """Write the precomputed duty cycle for the current step"""
+        self._step_deadline = math.inf
+        step = self.current_step
+        duty = self._hw_levels[step]
+        if duty == self._last_duty:
+            return
         try:
-            # Move to next brightness level
-            self.current_step = (self.current_step + 1) % len(self.brightness_levels)
-            # Set the new brightness from our levels list
-            raw_value = self.brightness_levels[self.current_step]
-            self.set_brightness(raw_value)
-            logger.debug(f"Set brightness to {self.get_brightness_percentage()}%")
-        except Exception as e:
+            self._set_duty(duty)
+            self._last_duty = duty
+            logger.info("Brightness changed to %d%%", self._pct_levels[step])
+        except (pigpio.error, OSError) as e:
             logger.error(f"Failed to set brightness: {str(e)}")
-            raise BacklightError(f"Failed to step brightness: {str(e)}")
+            self._check_connection()
+
+    def restore_step(self, step: int) -> None:
+        """Set brightness back to a previously saved step"""
+        self.set_brightness(self.brightness_levels[step])
+        self.current_step = step
 
     def get_brightness_percentage(self) -> int:
         """Get current brightness as percentage"""
-        if not self.pi or not self.pi.connected:
+        if not self._ready:
             logger.error("Attempted to get brightness but PWM not initialized")
             raise BacklightError("PWM not initialized")
 
-        return int(self.brightness_levels[self.current_step] * 100)
+        return self._pct_levels[self.current_step]
+
+    def ping(self) -> bool:
+        """Check pigpiod still answers on the connection"""
+        if not (self.pi and self.pi.connected):
+            return False
+        try:
+            # pi.connected is only set when connecting, so make a round trip
+            self.pi.get_current_tick()
+            return True
+        except Exception:
+            return False
+
+    def _check_connection(self) -> None:
+        """Mark the PWM unusable if a failed write was due to losing pigpiod"""
+        if self._ready and not self.ping():
+            self._ready = False
+            logger.error("Lost connection to pigpio daemon")
 
     def cleanup(self) -> None:
         """Clean up pigpio resources"""
-        if self.pi and self.pi.connected:
+        self._step_deadline = math.inf
+        if self._ready:
+            self._ready = False
             try:
                 logger.info("Cleaning up PWM device")
                 self.pi.hardware_PWM(self.pin, 0, 0)
+                self._last_duty = 0
                 self.pi.stop()
+                self.pi = None
             except Exception as e:
                 logger.error(f"Error during PWM cleanup: {str(e)}")
                 raise BacklightError(f"Failed to cleanup PWM device: {str(e)}")
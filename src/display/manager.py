@@ -1,33 +1,97 @@
 # vim:tabstop=4:softtabstop=4:shiftwidth=4:textwidth=79:expandtab:autoindent:smartindent:fileformat=unix:
 
+import math
+import os
+import signal
 import subprocess
+import sys
 import time
 import logging
 from typing             import Optional
 from pathlib            import Path
 from ..utils.exceptions import DisplayError
 from ..utils.config     import Config
-from ..utils.constants  import CONFIRMATION_TIMEOUT
+from ..utils.constants  import CONFIRMATION_TIMEOUT, ConfirmationMode
 from .tmux              import TMuxController
 from .backlight         import DisplayBacklight
 
 logger = logging.getLogger('DisplayController')
 
+# Home cursor, clear screen and scrollback (what clear(1) emits)
+CLEAR_SCREEN = "\033[H\033[2J\033[3J"
+
+# Menu screens including the screen clear, rendered once at import
+_PIHOLE_MENU_SCREEN = (
+    f"{CLEAR_SCREEN}"
+    "    +---------------------------------+\n"
+    "    |       Pi-Hole Update Menu       |\n"
+    "    +---------------------------------+\n"
+    "\n\n"
+    "    Button 2: Update Gravity\n"
+    "    - press to update blocklists\n"
+    "\n\n"
+    "    Button 3: Update Pi-hole\n"
+    "    - press to update core software\n"
+    "\n\n"
+    "    Button 4: Update PADD\n"
+    "    - press to update dashboard code\n"
+    "\n\n"
+    f"    Waiting {CONFIRMATION_TIMEOUT:g}s for selection\n"
+    "    Any other button cancels\n"
+)
+_SYSTEM_MENU_SCREEN = (
+    f"{CLEAR_SCREEN}"
+    "    +--------------------------------+\n"
+    "    |      System Control Menu       |\n"
+    "    +--------------------------------+\n"
+    "\n\n"
+    "    Button 2: Update System\n"
+    "    - press to update RPi OS and system packages\n"
+    "\n\n"
+    "    Button 3: Restart System\n"
+    "    - press to reboot\n"
+    "\n\n"
+    "    Button 4: Shutdown System\n"
+    "    - press to shutdown, then power off\n"
+    "\n\n"
+    f"    Waiting {CONFIRMATION_TIMEOUT:g}s for selection...\n"
+    "    Any other button cancels\n"
+)
+
+def _is_padd_process(pid: int) -> bool:
+    """Check pid still runs padd.sh, PIDs are reused once a process exits"""
+    try:
+        return b'padd.sh' in Path(f'/proc/{pid}/cmdline').read_bytes()
+    except OSError:
+        return False
+
 class DisplayManager:
     """Manages display output and PADD integration"""
 
-    def __init__(self):
+    def __init__(self, config: Optional[Config] = None):
         """
         Initialize display manager with TMux controller.
         One tmux window for PADD, one for the PiHole menus
+
+        Args:
+            config: Optional already loaded Config instance
         """
-        self.tmux = TMuxController()
+        self.tmux = TMuxController(config)
         self.backlight = None
-        self._previous_brightness = 1.0
-        config = Config().display['tmux']
-        self.session_name = config['session_name']
+        self._previous_step = 0
+        # Menu waiting for confirmation, shared by the PiHole and SystemOps controllers
+        self.confirmation_mode = ConfirmationMode.NONE
+        # Monotonic time the open menu times out at, see confirmation_timed_out
+        self._confirmation_deadline = math.inf
+        # Reuse the tmux settings the controller already resolved
+        config = self.tmux.config
+        self.session_name = self.tmux.session_name
         self.padd_window = config['padd_window']
         self.control_window = config['control_window']
+        # PID of padd.sh, looked up again once it no longer runs padd.sh
+        self._padd_pid: Optional[int] = None
+        # Monotonic time of a deferred switch back to PADD, see poll_switch
+        self._switch_deadline = math.inf
 
     def set_backlight(self, backlight: DisplayBacklight) -> None:
         """Set the backlight controller"""
@@ -36,26 +100,17 @@ class DisplayManager:
     def check_padd(self) -> bool:
         """
         Verify PADD session exists and is running
+
         Returns: True if session exists, False otherwise
         """
-        try:
-            logger.debug("Checking for PADD tmux session")
-            result = subprocess.run(
-                ['tmux', 'has-session', '-t', self.session_name],
-                capture_output=True
-            )
-
-            if result.returncode != 0:
-                logger.error("PADD tmux session not found")
-                return False
-
-            logger.debug("PADD tmux session found")
-            return True
-
-        except Exception as e:
-            logger.error(f"Error checking PADD session: {e}")
+        logger.debug("Checking for PADD tmux session")
+        if not self.tmux.has_session():
+            logger.error("PADD tmux session not found")
             return False
 
+        logger.debug("PADD tmux session found")
+        return True
+
     def show_pihole_menu(self) -> bool:
         """
         Show pihole menu selection screen
@@ -63,30 +118,17 @@ class DisplayManager:
         """
         try:
             logger.debug("Switching to control window for pihole menu")
+            self._switch_deadline = math.inf
             self.tmux.switch_window(self.control_window)
 
             # Set display to full brightness
             if self.backlight:
-                self._previous_brightness = self.backlight.brightness_levels[self.backlight.current_step]
+                self._previous_step = self.backlight.current_step
                 self.backlight.set_brightness(1.0)
 
-            self._clear_screen()
-
-            print("    +---------------------------------+")
-            print("    |       Pi-Hole Update Menu       |")
-            print("    +---------------------------------+")
-            print("\n")
-            print("    Button 2: Update Gravity")
-            print("    - press to update blocklists")
-            print("\n")
-            print("    Button 3: Update Pi-hole")
-            print("    - press to update core software")
-            print("\n")
-            print("    Button 4: Update PADD")
-            print("    - press to update dashboard code")
-            print("\n")
-            print(f"    Waiting {CONFIRMATION_TIMEOUT}s for selection")
-            print("    Any other button cancels")
+            # Clear and draw the menu in one write
+            sys.stdout.write(_PIHOLE_MENU_SCREEN)
+            sys.stdout.flush()
 
             return True
 
@@ -101,30 +143,17 @@ class DisplayManager:
         """
         try:
             logger.debug("Switching to control window for system control")
+            self._switch_deadline = math.inf
             self.tmux.switch_window(self.control_window)
 
             # Set display to full brightness
             if self.backlight:
-                self._previous_brightness = self.backlight.brightness_levels[self.backlight.current_step]
+                self._previous_step = self.backlight.current_step
                 self.backlight.set_brightness(1.0)
 
-            self._clear_screen()
-
-            print("    +--------------------------------+")
-            print("    |      System Control Menu       |")
-            print("    +--------------------------------+")
-            print("\n")
-            print("    Button 2: Update System")
-            print("    - press to update RPi OS and system packages")
-            print("\n")
-            print("    Button 3: Restart System")
-            print("    - press to reboot")
-            print("\n")
-            print("    Button 4: Shutdown System")
-            print("    - press to shutdown, then power off")
-            print("\n")
-            print(f"    Waiting {CONFIRMATION_TIMEOUT}s for selection...")
-            print("    Any other button cancels")
+            # Clear and draw the menu in one write
+            sys.stdout.write(_SYSTEM_MENU_SCREEN)
+            sys.stdout.flush()
 
             return True
 
@@ -132,8 +161,78 @@ class DisplayManager:
             logger.error(f"Error showing system control: {e}")
             return False
 
+    def start_confirmation(self, mode: ConfirmationMode) -> None:
+        """
+        Mark a menu as waiting for confirmation and start its timeout
+
+        Args:
+            mode: Menu that was opened
+        """
+        self.confirmation_mode = mode
+        self._confirmation_deadline = time.monotonic() + CONFIRMATION_TIMEOUT
+
+    def clear_confirmation(self, mode: ConfirmationMode) -> None:
+        """
+        Stop waiting for confirmation if mode's menu is the open one
+
+        Args:
+            mode: Menu being closed
+        """
+        if self.confirmation_mode is mode:
+            self.confirmation_mode = ConfirmationMode.NONE
+            self._confirmation_deadline = math.inf
+
+    @property
+    def confirmation_deadline(self) -> float:
+        """Monotonic time the open menu times out at, inf if none is open"""
+        return self._confirmation_deadline
+
+    def confirmation_timed_out(self) -> bool:
+        """
+        Check whether the open menu's confirmation timeout has passed
+
+        A deadline that has passed is cleared either way, so it is reported
+        once and never left behind for the dispatch loop to keep polling.
+        """
+        if time.monotonic() < self._confirmation_deadline:
+            return False
+        self._confirmation_deadline = math.inf
+        return self.confirmation_mode is not ConfirmationMode.NONE
+
+    def switch_to_padd_later(self, delay: float) -> None:
+        """
+        Switch back to PADD once delay seconds have passed
+
+        The caller returns straight away, the switch is made by poll_switch
+        from the button dispatch loop. Showing a menu first cancels it.
+
+        Args:
+            delay: Seconds to leave the current screen up
+        """
+        self._switch_deadline = time.monotonic() + delay
+
+    @property
+    def switch_deadline(self) -> float:
+        """Monotonic time of the deferred switch to PADD, inf if none"""
+        return self._switch_deadline
+
+    def poll_switch(self) -> None:
+        """Make the deferred switch to PADD if it is due"""
+        if time.monotonic() >= self._switch_deadline:
+            self.switch_to_padd()
+
+    def keep_brightness_step(self) -> None:
+        """
+        Make the current brightness step the one restored when switching
+        back to PADD, so a step taken while a deferred switch is pending
+        is not undone by it
+        """
+        if self.backlight:
+            self._previous_step = self.backlight.current_step
+
     def switch_to_padd(self) -> None:
         """Switch to PADD window and force refresh"""
+        self._switch_deadline = math.inf
         try:
             logger.debug("Switching to PADD window")
 
@@ -144,12 +243,7 @@ class DisplayManager:
             self.tmux.switch_window(self.padd_window)
             # Restore previous brightness
             if self.backlight:
-                self.backlight.set_brightness(self._previous_brightness)
-                # Also update current_step to match
-                for i, level in enumerate(self.backlight.brightness_levels):
-                    if level == self._previous_brightness:
-                        self.backlight.current_step = i
-                        break
+                self.backlight.restore_step(self._previous_step)
             logger.debug("Successfully switched to PADD window")
         except Exception as e:
             logger.error(f"Error switching to PADD window: {e}")
@@ -167,48 +261,51 @@ class DisplayManager:
         This is especially useful after Pi-hole updates that restart FTL,
         ensuring PADD recovers from "No connection to FTL!" errors.
         """
+        # Signal the cached PADD process while it is still padd.sh
+        if self._padd_pid is not None:
+            if _is_padd_process(self._padd_pid):
+                try:
+                    os.kill(self._padd_pid, signal.SIGWINCH)
+                    logger.debug("Sent WINCH signal to PADD process %d", self._padd_pid)
+                    return
+                except ProcessLookupError:
+                    pass
+                except OSError as e:
+                    logger.debug("Could not send WINCH signal to PADD: %s", e)
+                    return
+            self._padd_pid = None
+
         try:
             # Get PID of padd.sh process in the padd window
-            result = subprocess.run(
-                ['tmux', 'list-panes', '-t', f'{self.session_name}:{self.padd_window}',
-                 '-F', '#{pane_pid}'],
-                capture_output=True,
-                text=True,
-                check=True
-            )
-
-            pane_pid = result.stdout.strip()
-            if not pane_pid:
+            pane_pid = self.tmux.get_pane_pid(self.padd_window)
+            if pane_pid is None:
                 logger.warning("Could not find PADD pane PID for refresh")
                 return
 
             # Get the actual padd.sh process PID (child of the shell in tmux pane)
             ps_result = subprocess.run(
-                ['pgrep', '-P', pane_pid, '-f', 'padd.sh'],
+                ['pgrep', '-P', str(pane_pid), '-f', 'padd.sh'],
                 capture_output=True,
                 text=True
             )
 
-            padd_pid = ps_result.stdout.strip()
-            if padd_pid:
+            padd_pids = ps_result.stdout.split()
+            if padd_pids:
                 # Send WINCH (Window Change) signal to force PADD to redraw
-                subprocess.run(['kill', '-WINCH', padd_pid], check=False)
-                logger.debug(f"Sent WINCH signal to PADD process {padd_pid}")
+                padd_pid = int(padd_pids[0])
+                os.kill(padd_pid, signal.SIGWINCH)
+                self._padd_pid = padd_pid
+                logger.debug("Sent WINCH signal to PADD process %d", padd_pid)
             else:
                 logger.debug("PADD process not found, skipping WINCH signal")
 
         except Exception as e:
             # Non-critical - PADD will still work, just might not refresh immediately
-            logger.debug(f"Could not send WINCH signal to PADD: {e}")
+            logger.debug("Could not send WINCH signal to PADD: %s", e)
 
-    def _clear_screen(self) -> None:
-        """Clear the LCD screen and reset cursor position"""
+    def cleanup(self) -> None:
+        """Clean up display resources"""
         try:
-            # Clear screen
-            subprocess.run(['clear'], check=True)
-            # Move cursor to top
-            print("\033[H", end="")
-        except subprocess.SubprocessError as e:
-            logger.error(f"Failed to clear screen: {e}")
-            raise DisplayError(f"Failed to clear screen: {e}")
-
+            self.tmux.cleanup()
+        except Exception as e:
+            logger.error(f"Error during display cleanup: {str(e)}")
@@ -1,52 +1,212 @@
 # vim:tabstop=4:softtabstop=4:shiftwidth=4:textwidth=79:expandtab:autoindent:smartindent:fileformat=unix:
 
+import shlex
 import subprocess
 import logging
 from pathlib            import Path
+from functools          import lru_cache
+from threading          import Lock
+from typing             import List, Optional, Tuple
 from ..utils.exceptions import DisplayError
 from ..utils.constants  import PATHS
 from ..utils.config     import Config
 
 logger = logging.getLogger('DisplayController')
 
+@lru_cache(maxsize=1)
+def _tmux_available() -> None:
+    """
+    Verify tmux is installed and available, probed once per process
+
+    Raises:
+        DisplayError: If tmux cannot be run
+    """
+    try:
+        subprocess.run(['tmux', '-V'], capture_output=True, check=True)
+        logger.debug("Tmux is available")
+    except (subprocess.SubprocessError, FileNotFoundError) as e:
+        error_msg = "Tmux is not available on the system"
+        logger.critical(error_msg)
+        raise DisplayError(error_msg)
+
+class TMuxControlClient:
+    """
+    Long lived tmux control mode (-C) client
+
+    Runs tmux commands over one client process instead of forking a new
+    tmux client per command. The client owns its own hidden session so it
+    never attaches to, or resizes, the display session. That session is
+    destroyed by tmux once the client goes away, so it can't outlive a
+    crash.
+    """
+
+    def __init__(self, session_name: str):
+        """
+        Args:
+            session_name: Name of the session created for the control client
+        """
+        self.session_name = session_name
+        self._process: Optional[subprocess.Popen] = None
+        self._lock = Lock()
+
+    @property
+    def running(self) -> bool:
+        """Whether the control client process is alive"""
+        return self._process is not None and self._process.poll() is None
+
+    def start(self) -> bool:
+        """
+        Start the control client
+
+        Returns:
+            True if the client is ready for commands
+        """
+        try:
+            self._process = subprocess.Popen(
+                ['tmux', '-C', 'new-session', '-A', '-s', self.session_name, 'cat'],
+                stdin=subprocess.PIPE,
+                stdout=subprocess.PIPE,
+                stderr=subprocess.DEVNULL,
+                text=True,
+                bufsize=1
+            )
+            # Discard the reply to the new-session command itself
+            ok, output = self._read_reply()
+            if not ok:
+                raise DisplayError(' '.join(output) or "new-session failed")
+            ok, output = self.run(['set-option', 'destroy-unattached', 'on'])
+            if not ok:
+                raise DisplayError(' '.join(output) or "set-option failed")
+            logger.debug("Started tmux control client session %s", self.session_name)
+            return True
+        except (OSError, DisplayError) as e:
+            logger.warning(f"tmux control mode unavailable: {str(e)}")
+            self.close()
+            return False
+
+    def run(self, command: List[str]) -> Tuple[bool, List[str]]:
+        """
+        Run a tmux command through the control client
+
+        Commands chained with ';' are sent one at a time, as control mode
+        replies to each separately, stopping at the first failure.
+
+        Args:
+            command: tmux command and arguments, without the leading 'tmux'
+
+        Returns:
+            Tuple of (success, output lines)
+
+        Raises:
+            DisplayError: If the control client is not running or went away
+        """
+        commands: List[List[str]] = [[]]
+        for arg in command:
+            if arg == ';':
+                commands.append([])
+            else:
+                commands[-1].append(arg)
+
+        output: List[str] = []
+        with self._lock:
+            if not self.running:
+                raise DisplayError("tmux control client not running")
+            for part in commands:
+                try:
+                    self._process.stdin.write(shlex.join(part) + '\n')
+                    self._process.stdin.flush()
+                except OSError as e:
+                    raise DisplayError(f"tmux control client write failed: {str(e)}")
+                ok, lines = self._read_reply()
+                output.extend(lines)
+                if not ok:
+                    return False, output
+        return True, output
+
+    def _read_reply(self) -> Tuple[bool, List[str]]:
+        """Read one %begin ... %end/%error reply block, skipping notifications"""
+        in_block = False
+        lines: List[str] = []
+        while True:
+            line = self._process.stdout.readline()
+            if not line:
+                raise DisplayError("tmux control client closed")
+            line = line.rstrip('\n')
+            if not in_block:
+                in_block = line.startswith('%begin')
+                continue
+            if line.startswith('%end'):
+                return True, lines
+            if line.startswith('%error'):
+                return False, lines
+            lines.append(line)
+
+    def close(self) -> None:
+        """Remove the control session and stop the client"""
+        process, self._process = self._process, None
+        if process is None:
+            return
+        try:
+            if process.poll() is None:
+                process.stdin.write(shlex.join(['kill-session', '-t', f'={self.session_name}']) + '\n')
+                process.stdin.close()
+                process.wait(timeout=1)
+        except (OSError, subprocess.TimeoutExpired):
+            process.kill()
+
 class TMuxController:
     """Manages tmux sessions and windows"""
     
-    def __init__(self):
-        """Initialize TMux controller with configuration"""
-        self.config = Config().display['tmux']
+    def __init__(self, config: Optional[Config] = None):
+        """
+        Initialize TMux controller with configuration
+
+        Args:
+            config: Optional already loaded Config instance
+        """
+        self.config = (config or Config()).display['tmux']
         self.padd_path = PATHS['padd_script']
         self.session_name = self.config['session_name']
+        # Exact match targets, tmux otherwise falls back to matching any
+        # session whose name starts with the session name
+        self._target = f"={self.session_name}"
         self._verify_tmux_available()
+        self._window_cache: Optional[set[str]] = None
+        # Named so the display session name is not a prefix of it
+        self._control = TMuxControlClient(f"_{self.session_name}-control")
+        self._control.start()
 
     def _verify_tmux_available(self) -> None:
         """Verify tmux is installed and available"""
-        try:
-            subprocess.run(['tmux', '-V'], capture_output=True, check=True)
-            logger.debug("Tmux is available")
-        except (subprocess.SubprocessError, FileNotFoundError) as e:
-            error_msg = "Tmux is not available on the system"
-            logger.critical(error_msg)
-            raise DisplayError(error_msg)
+        _tmux_available()
     
-    def _run_tmux_command(self, command: list[str], check: bool = True) -> subprocess.CompletedProcess:
+    def _run_tmux_command(self, command: list[str], check: bool = True,
+                          decode: bool = True) -> subprocess.CompletedProcess:
         """
         Run a tmux command with proper error handling
         
         Args:
             command: List of command components
             check: Whether to raise on non-zero exit
+            decode: Decode output as text, pass False when only the
+                return code is used
             
         Returns:
             CompletedProcess instance
         """
         try:
             full_command = ['tmux'] + command
-            logger.debug(f"Running tmux command: {' '.join(full_command)}")
+            if logger.isEnabledFor(logging.DEBUG):
+                logger.debug("Running tmux command: %s", shlex.join(full_command))
+            if self._control.running:
+                try:
+                    return self._run_control_command(full_command, check, decode)
+                except DisplayError as e:
+                    logger.warning(f"tmux control client failed, forking tmux: {str(e)}")
             result = subprocess.run(
                 full_command,
                 capture_output=True,
-                text=True,
+                text=decode,
                 check=check
             )
             return result
@@ -57,20 +217,80 @@ class TMuxController:
                 raise DisplayError(error_msg)
             return e.returncode
 
+    def _run_control_command(self, full_command: list[str], check: bool,
+                             decode: bool) -> subprocess.CompletedProcess:
+        """
+        Run a tmux command through the control client
+
+        Args:
+            full_command: Command list including the leading 'tmux'
+            check: Whether to raise on failure
+            decode: Return output as text rather than bytes
+
+        Returns:
+            CompletedProcess instance mirroring a forked tmux run
+
+        Raises:
+            DisplayError: If the control client is unusable
+            subprocess.CalledProcessError: If check is set and the command failed
+        """
+        ok, lines = self._control.run(full_command[1:])
+        text = ''.join(line + '\n' for line in lines)
+        out = text if decode else text.encode()
+        empty = '' if decode else b''
+        # tmux reports errors in the reply block, the CLI prints them on stderr
+        stdout, stderr = (out, empty) if ok else (empty, out)
+        if check and not ok:
+            raise subprocess.CalledProcessError(1, full_command, output=stdout, stderr=stderr)
+        return subprocess.CompletedProcess(full_command, 0 if ok else 1, stdout, stderr)
+
     def has_session(self) -> bool:
         """Check if session exists"""
+        command = ['has-session', '-t', self._target]
         try:
-            result = self._run_tmux_command(
-                ['has-session', '-t', self.session_name],
-                check=False
-            )
+            result = self._run_tmux_command(command, check=False, decode=False)
             exists = result.returncode == 0
-            logger.debug(f"Session {self.session_name} exists: {exists}")
+            logger.debug("Session %s exists: %s", self.session_name, exists)
             return exists
         except Exception:
             logger.error(f"Error checking session {self.session_name}")
             return False
 
+    def _get_windows(self, refresh: bool = False) -> set[str]:
+        """
+        Get window names of the session, cached after the first lookup
+
+        Args:
+            refresh: Reload the window names from tmux
+        """
+        if self._window_cache is None or refresh:
+            result = self._run_tmux_command(
+                ['list-windows', '-t', self._target, '-F', '#{window_name}'],
+                check=False
+            )
+            if result.returncode != 0:
+                self._window_cache = None
+                return set()
+            self._window_cache = set(result.stdout.splitlines())
+        return self._window_cache
+
+    def get_pane_pid(self, window_name: str) -> Optional[int]:
+        """
+        Get the PID of the process running in a window's pane
+
+        Args:
+            window_name: Name of the window
+
+        Returns:
+            PID of the pane process, None if the window was not found
+        """
+        result = self._run_tmux_command(
+            ['list-panes', '-t', f'{self._target}:{window_name}', '-F', '#{pane_pid}'],
+            check=False
+        )
+        pids = result.stdout.split() if result.returncode == 0 else []
+        return int(pids[0]) if pids else None
+
     def switch_window(self, window_name: str) -> None:
         """
         Switch to specified window
@@ -79,36 +299,31 @@ class TMuxController:
             window_name: Name of window to switch to
         """
         try:
-            # Verify window exists
-            result = self._run_tmux_command(
-                ['list-windows', '-t', self.session_name],
-                check=False
-            )
-            
-            if result.returncode != 0 or not any(
-                window_name in line for line in result.stdout.splitlines()
-            ):
-                raise DisplayError(f"Window {window_name} not found")
-            
-            # Perform switch
-            self._run_tmux_command([
-                'select-window',
-                '-t', f'{self.session_name}:{window_name}'
-            ])
-            
-            # Verify switch
+            # Verify window exists, reloading the window list once on a miss
+            if window_name not in self._get_windows():
+                if window_name not in self._get_windows(refresh=True):
+                    raise DisplayError(f"Window {window_name} not found")
+
+            # Perform switch and read back the current window in one call
             current = self._run_tmux_command([
+                'select-window',
+                '-t', f'{self._target}:{window_name}',
+                ';',
                 'display-message',
-                '-p', '#W'  # Current window name
+                '-p', '-t', f'{self._target}:',
+                '#W'  # Current window name
             ])
-            
+
             if current.stdout.strip() != window_name:
                 raise DisplayError("Window switch verification failed")
-                
-            logger.debug(f"Successfully switched to window: {window_name}")
+
+            logger.debug("Successfully switched to window: %s", window_name)
             
         except Exception as e:
             error_msg = f"Failed to switch to window {window_name}: {str(e)}"
             logger.error(error_msg)
             raise DisplayError(error_msg)
 
+    def cleanup(self) -> None:
+        """Stop the tmux control client"""
+        self._control.close()
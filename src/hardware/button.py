@@ -3,8 +3,6 @@
 import time
 import logging
 from typing             import Callable, Optional
-from gpiozero           import Button as GPIOButton
-from gpiozero.exc       import GPIOZeroError
 from ..utils.exceptions import ButtonError
 from .models            import ButtonConfig
 
@@ -30,6 +28,13 @@ class ButtonHandler:
             callback: Optional function to call when button is pressed
             hold_callback: Optional function to call when button is released after hold
         """
+        self.button = None
+
+        # gpiozero pulls in a large dependency tree, so it is only imported
+        # once a button is actually created
+        from gpiozero     import Button as GPIOButton
+        from gpiozero.exc import GPIOZeroError
+
         try:
             self._hold_start: Optional[float] = None
             self._press_handled = False
@@ -68,9 +73,9 @@ class ButtonHandler:
         if hold_callback:
             def on_press():
                 """Handle button press"""
-                self._hold_start = time.time()
+                self._hold_start = time.monotonic()
                 self._press_handled = False
-                logger.debug(f"{self.function} button pressed at {self._hold_start}")
+                logger.debug("%s button pressed", self.function)
 
                 # If this is a button that can handle both press and hold,
                 # we'll wait to see if it's a hold before executing press
@@ -87,22 +92,22 @@ class ButtonHandler:
         if self._press_callback and not self._press_handled:
             self._press_callback()
             self._press_handled = True
-            logger.debug(f"{self.function} button press handled")
+            logger.debug("%s button press handled", self.function)
 
     def _on_release(self) -> None:
         """Handle button release and calculate hold duration"""
         if self._hold_start is not None:
-            hold_duration = time.time() - self._hold_start
-            logger.debug(f"{self.function} button released after {hold_duration:.2f}s")
+            hold_duration = time.monotonic() - self._hold_start
+            logger.debug("%s button released after %.2fs", self.function, hold_duration)
 
             # Check if this is a short press or a hold
             if self._hold_callback and hold_duration >= self.button.hold_time:
                 # This was a hold, execute hold callback
-                logger.debug(f"{self.function} executing hold callback")
+                logger.debug("%s executing hold callback", self.function)
                 self._hold_callback(hold_duration)
             else:
                 # This was a short press, execute press callback
-                logger.debug(f"{self.function} executing press callback")
+                logger.debug("%s executing press callback", self.function)
                 self._handle_press()
 
         self._hold_start = None
@@ -115,10 +120,11 @@ class ButtonHandler:
         This method ensures proper cleanup of GPIO resources
         """
         try:
-            if hasattr(self, 'button') and self.button is not None:
+            if self.button is not None:
                 pin_number = self.button.pin.number
                 self.button.close()
-                logger.debug(f"Cleaned up button on pin {pin_number}")
+                self.button = None
+                logger.debug("Cleaned up button on pin %s", pin_number)
             else:
                 logger.debug("No button to clean up")
         except Exception as e:
@@ -5,7 +5,11 @@ from typing             import Optional
 from ..utils.constants  import ButtonFunction  # Changed from .utils to ..utils
 from ..utils.exceptions import ConfigError   # Changed from .utils to ..utils
 
-@dataclass
+# Valid button function names, resolved once
+_VALID_FUNCTIONS: frozenset[str] = frozenset(f.value for f in ButtonFunction)
+_VALID_FUNCTIONS_STR = ', '.join(f.value for f in ButtonFunction)
+
+@dataclass(slots=True, frozen=True)
 class ButtonConfig:
     """Configuration settings for a button"""
     pin: int
@@ -22,13 +26,10 @@ class ButtonConfig:
         Raises:
             ConfigError: If button function is invalid
         """
-        try:
-            ButtonFunction(self.function)
-        except ValueError:
-            valid_functions = [f.value for f in ButtonFunction]
+        if self.function not in _VALID_FUNCTIONS:
             raise ConfigError(
                 f"Invalid button function: {self.function}. "
-                f"Must be one of: {', '.join(valid_functions)}"
+                f"Must be one of: {_VALID_FUNCTIONS_STR}"
             )
 
         # Validate pin number is positive
@@ -1,88 +1,104 @@
 # vim:tabstop=4:softtabstop=4:shiftwidth=4:textwidth=79:expandtab:autoindent:smartindent:fileformat=unix:
 
+import socket
+import struct
 import subprocess
 import time
 import logging
 
-from threading import Timer
-from typing    import Optional
+from typing    import Tuple
 from pathlib   import Path
 
 from ..utils.exceptions import ServiceError
 from ..utils.constants  import (
-    CONFIRMATION_TIMEOUT,
     FEEDBACK_DELAY,
+    GIT,
+    ConfirmationMode,
     PATHS,
+    SUDO,
     UPDATE_SELECT_HOLD
 )
 
 from ..display.manager  import DisplayManager
+from .process           import run_streamed
 
 logger = logging.getLogger('DisplayController')
 
+# CHAOS TXT query for local.api.ftl, the same probe PADD makes with dig
+_FTL_QUERY_ID = 0x4654
+_FTL_QUERY = (struct.pack('>6H', _FTL_QUERY_ID, 0x0100, 1, 0, 0, 0)
+              + b'\x05local\x03api\x03ftl\x00'
+              + struct.pack('>2H', 16, 3))
+
+def _ftl_responding(timeout: float = 1.0) -> bool:
+    """
+    Check whether FTL answers DNS queries on localhost
+
+    The query is sent straight from a UDP socket rather than by forking
+    dig. While FTL is down the connected socket gets ECONNREFUSED back
+    immediately, so each probe is cheap.
+
+    Args:
+        timeout: Seconds to wait for a reply
+
+    Returns:
+        True if FTL returned an answer
+    """
+    try:
+        with socket.socket(socket.AF_INET, socket.SOCK_DGRAM) as sock:
+            sock.settimeout(timeout)
+            sock.connect(('127.0.0.1', 53))
+            sock.send(_FTL_QUERY)
+            reply = sock.recv(512)
+    except OSError:
+        return False
+    if len(reply) < 12:
+        return False
+    ident, flags, _, answers = struct.unpack_from('>4H', reply)
+    return ident == _FTL_QUERY_ID and flags & 0x000F == 0 and answers > 0
+
 class PiHole:
     """Manages PiHole requests and operations"""
 
     def __init__(self, display_manager: DisplayManager):
         try:
             self.display = display_manager
-            self._waiting_for_confirmation = False
-            self._confirmation_timer: Optional[Timer] = None
             logger.info("Initializing PiHole controller")
         except Exception as e:
-            logger.error(f"Failed to initialize PiHole controller: {str(e)}")
+            logger.error("Failed to initialize PiHole controller: %s", e)
             raise ServiceError(f"Failed to initialize PiHole controller: {str(e)}")
 
-    def _start_confirmation_timer(self) -> None:
-        """Start confirmation timeout timer"""
-        if self._confirmation_timer:
-            self._confirmation_timer.cancel()
-        self._confirmation_timer = Timer(CONFIRMATION_TIMEOUT, self._handle_timeout)
-        self._confirmation_timer.start()
-        logger.debug("Started confirmation timer")
-
-    def _handle_timeout(self) -> None:
-        """Handle confirmation timeout"""
-        if self._waiting_for_confirmation:
-            logger.info("Update selection timeout - cancelling")
-            self.cancel_update()
-
     def _clear_confirmation_state(self) -> None:
         """Clear all confirmation state"""
-        if self._confirmation_timer:
-            self._confirmation_timer.cancel()
-            self._confirmation_timer = None
-        self._waiting_for_confirmation = False
+        self.display.clear_confirmation(ConfirmationMode.PIHOLE)
         logger.debug("Cleared confirmation state")
 
     def is_waiting_for_confirmation(self) -> bool:
         """Check if waiting for user confirmation"""
-        return self._waiting_for_confirmation
+        return self.display.confirmation_mode is ConfirmationMode.PIHOLE
 
     def cancel_update(self) -> None:
         """Cancel any pending update confirmation"""
-        if self._waiting_for_confirmation:
+        if self.is_waiting_for_confirmation():
             logger.info("Update cancelled")
             print("\n    Update cancelled")
             self._clear_confirmation_state()
-            time.sleep(FEEDBACK_DELAY)
-            self.display.switch_to_padd()
+            self.display.switch_to_padd_later(FEEDBACK_DELAY)
 
     def show_menu(self, hold_time: float) -> None:
         """Handle button 2 hold event for showing Pi-Hole menu"""
-        logger.info(f"Button 2 held for {hold_time:.1f} seconds")
+        logger.info("Button 2 held for %.1f seconds", hold_time)
 
         if hold_time >= UPDATE_SELECT_HOLD:
             logger.info("Showing Pi-Hole menu")
-            self._waiting_for_confirmation = True
-            self._start_confirmation_timer()
+            self.display.start_confirmation(ConfirmationMode.PIHOLE)
             if not self.display.show_pihole_menu():
                 logger.error("Failed to show pihole menu screen")
                 self.cancel_update()
 
     def request_gravity_update(self) -> None:
         """Handle button 2 press for gravity update confirmation"""
-        if self._waiting_for_confirmation:
+        if self.is_waiting_for_confirmation():
             print("    Gravity update selected\n")
             logger.info("Gravity update selected")
             self._clear_confirmation_state()
@@ -90,7 +106,7 @@ class PiHole:
 
     def request_pihole_update(self) -> None:
         """Handle button 3 press for pihole update confirmation"""
-        if self._waiting_for_confirmation:
+        if self.is_waiting_for_confirmation():
             print("    Pi-hole update selected\n")
             logger.info("Pi-hole update selected")
             self._clear_confirmation_state()
@@ -98,169 +114,113 @@ class PiHole:
 
     def request_padd_update(self) -> None:
         """Handle button 4 press for PADD update confirmation"""
-        if self._waiting_for_confirmation:
+        if self.is_waiting_for_confirmation():
             print("    PADD update selected\n")
             logger.info("PADD update selected")
             self._clear_confirmation_state()
             self.update_padd()
 
 
-    def _run_process_command(self, command: list[str], operation: str, cwd: Optional[str] = None, finish: bool = True) -> int:
+    def _run_process_command(self, command: list[str], operation: str,
+                             finish: bool = True, wait_for_ftl: bool = False,
+                             capture: bool = True) -> Tuple[int, str]:
         """
-        Execute a process command with proper output handling
+        Execute a process command, streaming its output to the display
 
         Args:
             command: Command list to execute
-            operation: Operation name for logging
-            cwd: Optional working directory for command
-            finish: Whether to switch back to PADD when done
+            operation: Operation name for logging and feedback
+            finish: Whether to report the result and switch back to PADD
+            wait_for_ftl: Wait for FTL to recover before switching back
+            capture: Whether the caller needs the output text
 
         Returns:
-            Process return code
+            tuple containing (return_code, output_text)
         """
-        logger.info(f"Starting {operation}")
+        logger.info("Starting %s", operation)
         try:
-            process = subprocess.Popen(
-                command,
-                stdout=subprocess.PIPE,
-                stderr=subprocess.PIPE,
-                text=True,
-                bufsize=1,
-                universal_newlines=True,
-                cwd=cwd
-            )
-
-            while process.poll() is None:
-                line = process.stdout.readline()
-                if line:
-                    print(line.rstrip())
-
-            returncode = process.wait()
+            returncode, output, errors = run_streamed(command, indent=b'    ',
+                                                       capture=capture)
+            stderr = errors.decode(errors='replace')
 
             if returncode == 0:
-                logger.info(f"{operation} completed successfully")
+                logger.info("%s completed successfully", operation)
                 if finish:
                     print(f"\n    {operation} completed successfully")
             else:
-                logger.error(f"{operation} failed")
+                logger.error("%s failed with return code %d", operation, returncode)
                 if finish:
                     print(f"\n    {operation} failed")
+                for line in stderr.splitlines():
+                    logger.error("%s error: %s", operation, line)
+                    print(f"    {line}")
 
-            return returncode
+            return returncode, output.decode(errors='replace')
 
-        except subprocess.SubprocessError as e:
-            logger.error(f"Failed to {operation}: {str(e)}")
-            if finish:
-                print(f"\n    Error: Failed to {operation}: {str(e)}")
-            raise ServiceError(f"Failed to {operation}: {str(e)}")
+        except (subprocess.SubprocessError, OSError) as e:
+            error_msg = f"Failed to run {operation}: {str(e)}"
+            logger.error(error_msg)
+            print(f"\n    Error: {error_msg}")  # Always show error
+            raise ServiceError(error_msg)
         finally:
             if finish:
+                if wait_for_ftl:
+                    # Wait for FTL service to restart, the result stays on
+                    # screen meanwhile so no separate pause is needed first
+                    self._wait_for_ftl_recovery()
                 time.sleep(FEEDBACK_DELAY)
                 self.display.switch_to_padd()
 
     def update_gravity(self) -> None:
         """Execute gravity update (update Pi-hole's blocklists)"""
-        logger.info("Starting gravity update")
-
+        print("\n    Updating gravity (blocklists)...")
         try:
-            print("\n    Updating gravity (blocklists)...")
-
-            # Run pihole gravity update
-            process = subprocess.Popen(
-                ['sudo', 'pihole', '-g'],
-                stdout=subprocess.PIPE,
-                stderr=subprocess.PIPE,
-                text=True,
-                bufsize=1,
-                universal_newlines=True
-            )
-
-            # Stream output to display in real-time
-            while process.poll() is None:
-                line = process.stdout.readline()
-                if line:
-                    print(f"    {line.rstrip()}")
-
-            # Get any remaining output
-            remaining_stdout, stderr = process.communicate()
-            if remaining_stdout:
-                for line in remaining_stdout.splitlines():
-                    print(f"    {line}")
-
-            returncode = process.returncode
-
-            # Provide feedback based on result
-            if returncode == 0:
-                logger.info("Gravity update completed successfully")
-                print("\n    Gravity update completed successfully")
-            else:
-                logger.error(f"Gravity update failed with return code {returncode}")
-                print("\n    Gravity update failed")
-                # Display stderr if present
-                if stderr:
-                    for line in stderr.splitlines():
-                        logger.error(f"Gravity update error: {line}")
-                        print(f"    {line}")
-
-        except Exception as e:
-            logger.error(f"Failed to update gravity: {str(e)}")
-            print(f"\n    Error: Failed to update gravity: {str(e)}")
-        finally:
-            time.sleep(FEEDBACK_DELAY)
-            self.display.switch_to_padd()
+            self._run_process_command([SUDO, 'pihole', '-g'], 'Gravity update',
+                                      capture=False)
+        except ServiceError:
+            pass  # Already logged and shown
 
     def update_pihole(self) -> None:
         """Execute Pi-hole core software update"""
-        logger.info("Starting Pi-hole update")
-
+        print("\n    Updating Pi-hole core software...")
         try:
-            print("\n    Updating Pi-hole core software...")
+            self._run_process_command([SUDO, 'pihole', '-up'], 'Pi-hole update',
+                                      wait_for_ftl=True, capture=False)
+        except ServiceError:
+            pass  # Already logged and shown
 
-            # Run pihole update
-            process = subprocess.Popen(
-                ['sudo', 'pihole', '-up'],
-                stdout=subprocess.PIPE,
-                stderr=subprocess.PIPE,
-                text=True,
-                bufsize=1,
-                universal_newlines=True
-            )
-
-            # Stream output to display in real-time
-            while process.poll() is None:
-                line = process.stdout.readline()
-                if line:
-                    print(f"    {line.rstrip()}")
-
-            # Get any remaining output
-            remaining_stdout, stderr = process.communicate()
-            if remaining_stdout:
-                for line in remaining_stdout.splitlines():
-                    print(f"    {line}")
+    def _padd_up_to_date(self, padd_dir: Path) -> bool:
+        """
+        Check whether the PADD checkout matches the remote HEAD
 
-            returncode = process.returncode
+        Only the remote ref is looked up, no objects are fetched. Any
+        failure counts as out of date so the normal pull still runs.
 
-            # Provide feedback based on result
-            if returncode == 0:
-                logger.info("Pi-hole update completed successfully")
-                print("\n    Pi-hole update completed successfully")
-            else:
-                logger.error(f"Pi-hole update failed with return code {returncode}")
-                print("\n    Pi-hole update failed")
-                # Display stderr if present
-                if stderr:
-                    for line in stderr.splitlines():
-                        logger.error(f"Pi-hole update error: {line}")
-                        print(f"    {line}")
+        Args:
+            padd_dir: PADD git checkout
 
-        except Exception as e:
-            logger.error(f"Failed to update Pi-hole: {str(e)}")
-            print(f"\n    Error: Failed to update Pi-hole: {str(e)}")
-        finally:
-            time.sleep(FEEDBACK_DELAY)
-            # Wait for FTL service to restart and PADD to recover
-            self._wait_for_ftl_recovery()
-            self.display.switch_to_padd()
+        Returns:
+            True if the local HEAD is the remote HEAD
+        """
+        try:
+            local = subprocess.run(
+                [GIT, '-C', str(padd_dir), 'rev-parse', 'HEAD'],
+                capture_output=True,
+                text=True,
+                check=True,
+                timeout=10
+            ).stdout.strip()
+            remote = subprocess.run(
+                [GIT, '-C', str(padd_dir), 'ls-remote', 'origin', 'HEAD'],
+                capture_output=True,
+                text=True,
+                check=True,
+                timeout=30
+            ).stdout.split()
+        except (subprocess.SubprocessError, OSError) as e:
+            logger.debug("PADD remote check failed: %s", e)
+            return False
+        return bool(remote) and remote[0] == local
 
     def update_padd(self) -> None:
         """
@@ -276,34 +236,17 @@ class PiHole:
         try:
             print("\n    Updating PADD...")
 
-            # Run git pull and capture output
-            process = subprocess.Popen(
-                ['git', 'pull'],
-                cwd=str(padd_dir),
-                stdout=subprocess.PIPE,
-                stderr=subprocess.PIPE,
-                text=True,
-                bufsize=1,
-                universal_newlines=True
-            )
-
-            # Stream output to display
-            output_lines = []
-            while process.poll() is None:
-                line = process.stdout.readline()
-                if line:
-                    output_lines.append(line.rstrip())
-                    print(f"    {line.rstrip()}")
-
-            # Get any remaining output
-            remaining_stdout, stderr = process.communicate()
-            if remaining_stdout:
-                for line in remaining_stdout.splitlines():
-                    output_lines.append(line)
-                    print(f"    {line}")
+            # A checkout already at the remote HEAD needs no fetch or pull
+            if self._padd_up_to_date(padd_dir):
+                logger.info("PADD is already up to date")
+                print("\n    PADD is already up to date")
+                return
 
-            returncode = process.returncode
-            output_text = '\n'.join(output_lines)
+            returncode, output_text = self._run_process_command(
+                [GIT, '-C', str(padd_dir), 'pull', '--ff-only'],
+                'PADD update',
+                finish=False
+            )
 
             # Determine result and provide feedback
             if returncode == 0:
@@ -314,30 +257,22 @@ class PiHole:
                     logger.info("PADD updated successfully")
                     print("\n    PADD updated successfully")
             else:
-                logger.error(f"PADD update failed with return code {returncode}")
                 print("\n    PADD update failed")
-                if stderr:
-                    for line in stderr.splitlines():
-                        logger.error(f"PADD update error: {line}")
-                        print(f"    {line}")
-
-        except subprocess.TimeoutExpired:
-            logger.error("PADD update timed out")
-            print("\n    Error: Update timed out")
-        except Exception as e:
-            logger.error(f"Failed to update PADD: {str(e)}")
-            print(f"\n    Error: Failed to update PADD: {str(e)}")
+
+        except ServiceError:
+            pass  # Already logged and shown
         finally:
             time.sleep(FEEDBACK_DELAY)
             self.display.switch_to_padd()
 
-    def _wait_for_ftl_recovery(self, max_wait: int = 30, check_interval: float = 2.0) -> None:
+    def _wait_for_ftl_recovery(self, max_wait: int = 30, check_interval: float = 0.5) -> None:
         """
         Wait for FTL service to come back online after Pi-hole update.
 
         Pi-hole updates restart the FTL service, which can leave PADD in a bad state
         showing "No connection to FTL!" errors. This method waits for FTL to be
-        responsive again before returning control to PADD.
+        responsive again before returning control to PADD. No extra refresh
+        cycle is needed after that, switch_to_padd makes PADD redraw at once.
 
         Args:
             max_wait: Maximum seconds to wait for FTL recovery
@@ -346,37 +281,24 @@ class PiHole:
         logger.info("Waiting for FTL service to recover after Pi-hole update")
         print("\n    Waiting for FTL service to restart...")
 
-        start_time = time.time()
+        deadline = time.monotonic() + max_wait
         ftl_recovered = False
 
-        while (time.time() - start_time) < max_wait:
-            try:
-                # Check if FTL is responding using dig query (same method PADD uses)
-                result = subprocess.run(
-                    ['dig', '+short', '+time=1', '+tries=1', 'chaos', 'txt', 'local.api.ftl', '@localhost'],
-                    capture_output=True,
-                    text=True,
-                    timeout=2
-                )
+        while True:
+            if _ftl_responding():
+                logger.info("FTL service recovered successfully")
+                print("    FTL service is back online")
+                ftl_recovered = True
+                break
 
-                # If dig returns 0 and has output, FTL is responding
-                if result.returncode == 0 and result.stdout.strip():
-                    logger.info("FTL service recovered successfully")
-                    print("    FTL service is back online")
-                    ftl_recovered = True
-                    break
-
-            except (subprocess.SubprocessError, subprocess.TimeoutExpired):
-                pass  # FTL not ready yet, continue waiting
-
-            time.sleep(check_interval)
+            remaining = deadline - time.monotonic()
+            if remaining <= 0:
+                break
+            time.sleep(min(check_interval, remaining))
 
         if not ftl_recovered:
-            logger.warning(f"FTL service did not recover within {max_wait} seconds")
-            print(f"    Warning: FTL may still be restarting")
-
-        # Give PADD one more refresh cycle to update its display
-        time.sleep(1)
+            logger.warning("FTL service did not recover within %d seconds", max_wait)
+            print("    Warning: FTL may still be restarting")
 
     def cleanup(self) -> None:
         """Clean up PiHole resources"""
@@ -384,5 +306,5 @@ class PiHole:
             self._clear_confirmation_state()
             logger.info("Cleaned up PiHole controller")
         except Exception as e:
-            logger.error(f"Error during PiHole cleanup: {str(e)}")
+            logger.error("Error during PiHole cleanup: %s", e)
 
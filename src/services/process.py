@@ -0,0 +1,112 @@
+# vim:tabstop=4:softtabstop=4:shiftwidth=4:textwidth=79:expandtab:autoindent:smartindent:fileformat=unix:
+
+import os
+import selectors
+import subprocess
+import sys
+from threading import Lock
+from typing    import Tuple
+
+# One selector and read buffer for the life of the process, commands are
+# run one at a time under the lock. Reads land in the buffer and plain
+# output is written straight from it, only copied when it needs rewriting
+_selector = selectors.DefaultSelector()
+_buf = bytearray(65536)
+_view = memoryview(_buf)
+_lock = Lock()
+# Selector key tags
+_STDOUT, _STDERR, _EXIT = range(3)
+
+def _open_pidfd(pid: int) -> int:
+    """Open a pidfd for pid, -1 where the kernel or Python lacks them"""
+    try:
+        return os.pidfd_open(pid)
+    except (AttributeError, OSError):
+        return -1
+
+def run_streamed(command: list[str], indent: bytes = b'',
+                 capture: bool = True) -> Tuple[int, bytearray, bytearray]:
+    """
+    Run a command, showing its stdout on the display as it arrives
+
+    stdout and stderr are waited on together in one select, so output is
+    shown as soon as the command writes it and a full stderr pipe can't
+    stall the command. Each read returns whatever has been written so far,
+    which is written out with a single flush. Progress lines that redraw
+    with a bare CR are shown one per line.
+
+    The command's exit is watched through a pidfd in the same select. Once
+    it has exited, output already in the pipes is read and the run ends,
+    even if something it started in the background still holds the pipes
+    open.
+
+    Args:
+        command: Command list to execute
+        indent: Prefix written before each line of output
+        capture: Keep stdout as well as showing it, stderr is always kept
+
+    Returns:
+        tuple containing (return_code, stdout, stderr), stdout is empty
+        unless captured
+
+    Raises:
+        OSError, subprocess.SubprocessError: If the command fails to start
+    """
+    process = subprocess.Popen(
+        command,
+        stdout=subprocess.PIPE,
+        stderr=subprocess.PIPE
+    )
+
+    sys.stdout.flush()
+    out = sys.stdout.buffer
+    output = bytearray()
+    errors = bytearray()
+    buf = _buf
+    line_start = True
+    pidfd = _open_pidfd(process.pid)
+    with _lock, process.stdout, process.stderr:
+        selector = _selector
+        selector.register(process.stdout, selectors.EVENT_READ, _STDOUT)
+        selector.register(process.stderr, selectors.EVENT_READ, _STDERR)
+        if pidfd >= 0:
+            selector.register(pidfd, selectors.EVENT_READ, _EXIT)
+        try:
+            timeout = None
+            while selector.get_map():
+                events = selector.select(timeout)
+                if not events:
+                    break  # Exited and nothing left to read
+                for key, _ in events:
+                    if key.data is _EXIT:
+                        # Exited, only drain what is already buffered
+                        selector.unregister(pidfd)
+                        timeout = 0
+                        continue
+                    n = os.readv(key.fd, (buf,))
+                    if not n:
+                        selector.unregister(key.fileobj)
+                        continue
+                    chunk = _view[:n]
+                    if key.data is _STDERR:
+                        errors.extend(chunk)
+                        continue
+                    if capture:
+                        output.extend(chunk)
+                    if indent or buf.find(b'\r', 0, n) >= 0:
+                        chunk = buf[:n].replace(b'\r\n', b'\n').replace(b'\r', b'\n')
+                        if indent:
+                            if line_start:
+                                out.write(indent)
+                            line_start = chunk.endswith(b'\n')
+                            chunk = chunk[:-1].replace(b'\n', b'\n' + indent) + chunk[-1:]
+                    out.write(chunk)
+                    out.flush()
+        finally:
+            # Leave the shared selector empty if the loop was interrupted
+            for key in list(selector.get_map().values()):
+                selector.unregister(key.fileobj)
+            if pidfd >= 0:
+                os.close(pidfd)
+
+    return process.wait(), output, errors
@@ -3,15 +3,16 @@
 import subprocess
 import logging
 import time
-from threading import Timer
-from typing    import Optional, Tuple
+from typing    import Tuple
 from ..utils.exceptions import ServiceError
 from ..utils.constants  import (
-    CONFIRMATION_TIMEOUT,
     FEEDBACK_DELAY,
+    ConfirmationMode,
+    SUDO,
     SYSTEM_CONTROL_HOLD
 )
 from ..display.manager  import DisplayManager
+from .process           import run_streamed
 
 logger = logging.getLogger('DisplayController')
 
@@ -22,14 +23,13 @@ class SystemOps:
         """Initialize SystemOps controller"""
         try:
             self.display = display_manager
-            self._waiting_for_confirmation = False
-            self._confirmation_timer: Optional[Timer] = None
             logger.info("Initializing SystemOps controller")
         except Exception as e:
             logger.error(f"Failed to initialize SystemOps controller: {str(e)}")
             raise ServiceError(f"Failed to initialize SystemOps controller: {str(e)}")
 
-    def _run_process_command(self, command: list[str], operation: str, finish: bool = True) -> Tuple[int, str]:
+    def _run_process_command(self, command: list[str], operation: str, finish: bool = True,
+                             capture: bool = True) -> Tuple[int, str]:
         """
         Execute a process command with proper output handling
 
@@ -37,29 +37,14 @@ class SystemOps:
             command: Command list to execute
             operation: Operation name for logging
             finish: Whether to switch back to PADD when done
+            capture: Whether the caller needs the output text
 
         Returns:
             tuple containing (return_code, output_text)
         """
         logger.info(f"Starting {operation}")
-        output = ""
         try:
-            process = subprocess.Popen(
-                command,
-                stdout=subprocess.PIPE,
-                stderr=subprocess.PIPE,
-                text=True,
-                bufsize=1,
-                universal_newlines=True
-            )
-
-            while process.poll() is None:
-                line = process.stdout.readline()
-                if line:
-                    output += line
-                    print(line.rstrip())
-
-            returncode = process.wait()
+            returncode, output, errors = run_streamed(command, capture=capture)
 
             if returncode == 0:
                 logger.info(f"{operation} completed successfully")
@@ -69,10 +54,13 @@ class SystemOps:
                 logger.error(f"{operation} failed")
                 if finish:
                     print(f"\n    {operation} failed")
+                for line in errors.decode(errors='replace').splitlines():
+                    logger.error(f"{operation} error: {line}")
+                    print(f"    {line}")
 
-            return returncode, output
+            return returncode, output.decode(errors='replace')
 
-        except subprocess.SubprocessError as e:
+        except (subprocess.SubprocessError, OSError) as e:
             error_msg = f"Failed to {operation}: {str(e)}"
             logger.error(error_msg)
             print(f"\n    Error: {error_msg}")  # Always show error
@@ -88,27 +76,26 @@ class SystemOps:
 
         if hold_time >= SYSTEM_CONTROL_HOLD:
             logger.info("Showing system control menu")
-            self._waiting_for_confirmation = True
-            self._start_confirmation_timer()
+            self.display.start_confirmation(ConfirmationMode.SYSTEM)
             self.display.show_system_menu()
 
     def request_system_update(self) -> None:
         """button 2 press - confirm update"""
-        if self._waiting_for_confirmation:
+        if self.is_waiting_for_confirmation():
             logger.info("System update confirmed")
             self._clear_confirmation_state()
             self.update_system()
 
     def request_reboot(self) -> None:
         """button 3 press - confirm restart"""
-        if self._waiting_for_confirmation:
+        if self.is_waiting_for_confirmation():
             logger.info("System restart confirmed")
             self._clear_confirmation_state()
             self.reboot_system()
 
     def request_shutdown(self) -> None:
         """button 4 press - confirm shutdown"""
-        if self._waiting_for_confirmation:
+        if self.is_waiting_for_confirmation():
             logger.info("System shutdown confirmed")
             self._clear_confirmation_state()
             self.shutdown_system()
@@ -118,7 +105,7 @@ class SystemOps:
         try:
             print("\n    Updating package lists...")
             returncode, output = self._run_process_command(
-                ['sudo', 'apt', 'update'],
+                [SUDO, 'apt', 'update'],
                 'package list update',
                 finish=False
             )
@@ -140,16 +127,18 @@ class SystemOps:
 
             print("\n    Upgrading packages...")
             self._run_process_command(
-                ['sudo', 'apt', '-y', 'full-upgrade'],
+                [SUDO, 'apt', '-y', 'full-upgrade'],
                 'system upgrade',
-                finish=False
+                finish=False,
+                capture=False
             )
 
             print("\n    Autoremoving unused packages...")
             self._run_process_command(
-                ['sudo', 'apt', '-y', 'autoremove'],
+                [SUDO, 'apt', '-y', 'autoremove'],
                 'system upgrade',
-                finish=True
+                finish=True,
+                capture=False
             )
 
         except Exception as e:
@@ -164,7 +153,7 @@ class SystemOps:
         try:
             print("\n    Rebooting system...")
             time.sleep(FEEDBACK_DELAY)
-            subprocess.run(['sudo', 'reboot'], check=True)
+            subprocess.run([SUDO, 'reboot'], check=True)
         except subprocess.SubprocessError as e:
             logger.error(f"Failed to reboot system: {str(e)}")
             raise ServiceError(f"Failed to reboot system: {str(e)}")
@@ -175,43 +164,26 @@ class SystemOps:
         try:
             print("\n    Shutting down system...")
             time.sleep(FEEDBACK_DELAY)
-            subprocess.run(['sudo', 'shutdown', '-h', 'now'], check=True)
+            subprocess.run([SUDO, 'shutdown', '-h', 'now'], check=True)
         except subprocess.SubprocessError as e:
             logger.error(f"Failed to shutdown system: {str(e)}")
             raise ServiceError(f"Failed to shutdown system: {str(e)}")
 
-    def _start_confirmation_timer(self) -> None:
-        """Start confirmation timeout timer"""
-        if self._confirmation_timer:
-            self._confirmation_timer.cancel()
-        self._confirmation_timer = Timer(CONFIRMATION_TIMEOUT, self._handle_timeout)
-        self._confirmation_timer.start()
-
-    def _handle_timeout(self) -> None:
-        """Handle confirmation timeout"""
-        if self._waiting_for_confirmation:
-            logger.info("System control timeout - cancelling")
-            self.cancel_confirmation()
-
     def _clear_confirmation_state(self) -> None:
-        """Clear confirmation state and cancel timer"""
-        if self._confirmation_timer:
-            self._confirmation_timer.cancel()
-            self._confirmation_timer = None
-        self._waiting_for_confirmation = False
+        """Clear confirmation state and its timeout"""
+        self.display.clear_confirmation(ConfirmationMode.SYSTEM)
 
     def is_waiting_for_confirmation(self) -> bool:
         """Check if waiting for user confirmation"""
-        return self._waiting_for_confirmation
+        return self.display.confirmation_mode is ConfirmationMode.SYSTEM
 
     def cancel_confirmation(self) -> None:
         """Cancel pending system control confirmation"""
-        if self._waiting_for_confirmation:
+        if self.is_waiting_for_confirmation():
             logger.info("System control cancelled")
             print("\n    System control cancelled")
             self._clear_confirmation_state()
-            time.sleep(FEEDBACK_DELAY)
-            self.display.switch_to_padd()
+            self.display.switch_to_padd_later(FEEDBACK_DELAY)
 
     def cleanup(self) -> None:
         """Clean up SystemOps resources"""
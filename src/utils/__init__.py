@@ -1,5 +1,5 @@
 from .config     import Config
-from .constants  import ButtonFunction, CONFIRMATION_TIMEOUT, FEEDBACK_DELAY
+from .constants  import ButtonFunction, ConfirmationMode, CONFIRMATION_TIMEOUT, FEEDBACK_DELAY
 from .exceptions import (
     PiHoleDisplayError,
     DisplayError,
@@ -11,6 +11,7 @@ from .exceptions import (
 __all__ = [
     'Config',
     'ButtonFunction',
+    'ConfirmationMode',
     'CONFIRMATION_TIMEOUT',
     'FEEDBACK_DELAY',
     'PiHoleDisplayError',
@@ -2,11 +2,15 @@
 
 import yaml
 import logging
+from functools        import cached_property
 from logging.handlers import RotatingFileHandler
 from pathlib          import Path
 from typing           import Any, Dict
 from .exceptions      import ConfigError
 
+# libyaml's C loader when PyYAML was built with it, else the Python one
+_YAML_LOADER = getattr(yaml, 'CSafeLoader', yaml.SafeLoader)
+
 class Config:
     """Configuration handler for PiHole Display"""
 
@@ -33,7 +37,7 @@ class Config:
             config_file = root_dir / 'config' / 'config.yaml'
 
             with open(config_file, 'r') as f:
-                self._config = yaml.safe_load(f)
+                self._config = yaml.load(f, Loader=_YAML_LOADER)
         except Exception as e:
             raise ConfigError(f"Failed to load config: {str(e)}")
 
@@ -88,3 +92,12 @@ class Config:
         """Get button functions enumeration"""
         return self._config['button_functions']
 
+    @cached_property
+    def button_configs(self) -> Dict[str, 'ButtonConfig']:
+        """Get ButtonConfig instances keyed by button id, built once"""
+        # Imported here as hardware.models depends on this module
+        from ..hardware.models import ButtonConfig
+        return {
+            button_id: ButtonConfig(**cfg)
+            for button_id, cfg in self._config['buttons'].items()
+        }
@@ -1,6 +1,8 @@
 # vim:tabstop=4:softtabstop=4:shiftwidth=4:textwidth=79:expandtab:autoindent:smartindent:fileformat=unix:
 
-from enum    import Enum
+import shutil
+from enum    import Enum, IntEnum
+from typing  import Final
 from .config import Config
 
 # Load configuration
@@ -13,13 +15,23 @@ class ButtonFunction(Enum):
     CONFIRM_1 = config.button_functions['confirm_1']
     CONFIRM_2 = config.button_functions['confirm_2']
 
-# Timing constants
-CONFIRMATION_TIMEOUT = config.timing['confirmation_timeout']
-FEEDBACK_DELAY = config.timing['feedback_delay']
+class ConfirmationMode(IntEnum):
+    """Which menu, if any, is waiting for a confirmation button"""
+    NONE = 0
+    SYSTEM = 1
+    PIHOLE = 2
+
+# Timing constants, seconds as floats whether the YAML gives ints or not
+CONFIRMATION_TIMEOUT: Final[float] = float(config.timing['confirmation_timeout'])
+FEEDBACK_DELAY: Final[float] = float(config.timing['feedback_delay'])
 
 # Button hold thresholds
-SYSTEM_CONTROL_HOLD = float(config.buttons['1']['hold_time'])
-UPDATE_SELECT_HOLD = float(config.buttons['2']['hold_time'])
+SYSTEM_CONTROL_HOLD: Final[float] = float(config.buttons['1']['hold_time'])
+UPDATE_SELECT_HOLD: Final[float] = float(config.buttons['2']['hold_time'])
 
 # Paths
 PATHS = config.paths
+
+# Executables, resolved once up front rather than searched on each run
+SUDO = shutil.which('sudo') or 'sudo'
+GIT = shutil.which('git') or 'git'